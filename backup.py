@@ -1,16 +1,46 @@
+import atexit
+import hashlib
 import json
 import os
+import queue
+import re
 import subprocess
 import argparse
 import logging
+import logging.handlers
+import shlex
+import shutil
+import tempfile
+import threading
+import time
 import docker
 import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from docker.errors import DockerException
 from pathlib import Path
 from colorlog import ColoredFormatter
 from schema import Schema, And, Or, Use, Optional, SchemaError
 
 CONFIG_FILE = 'config.yaml'
+CONFIG_CACHE_FILE = CONFIG_FILE + '.cache.json'
+# No --info=progress2 by default: backup output is captured for --stats parsing, so
+# the ~10Hz progress formatting would go into a pipe nobody reads.
+DEFAULT_RSYNC_FLAGS = ["-a", "--delete", "-W", "--inplace"]
+SSH_CONTROL_PATH = "/tmp/abkp-%r@%h:%p"
+TUNING_FILE = Path.home() / ".cache" / "appdata_backup" / "tuning.json"
+MAX_RSYNC_WORKERS = 16
 
 # Setting up logging
 handler = logging.StreamHandler()
@@ -26,56 +56,158 @@ handler.setFormatter(ColoredFormatter(
     }
 ))
 
+# Worker threads only enqueue log records; the colorized formatting and the
+# stream write happen on the listener's background thread, so parallel rsync
+# workers never serialize on the handler lock.
+log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(log_queue, handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-logger.addHandler(handler)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
 logger.propagate = False
 
 _docker_clients = {}
+_docker_clients_lock = threading.Lock()
+
+_ssh_masters = {}
+_ssh_masters_lock = threading.Lock()
+
+_container_cache = {}
+_container_cache_lock = threading.Lock()
+
+_run_throughputs = []
+_run_throughputs_lock = threading.Lock()
+
+_notify_queue = []
+_notify_queue_lock = threading.Lock()
+
+_host_bucket_locks = {}
+_host_bucket_locks_lock = threading.Lock()
+
+def _host_bucket_lock(host):
+    with _host_bucket_locks_lock:
+        return _host_bucket_locks.setdefault(host, threading.Lock())
 
 config_schema = Schema({
     'backup_destination': And(str, len),
     Optional('store_by_group'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
+    Optional('max_parallel'): And(Use(int), lambda n: n > 0),
+    Optional('pipeline'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
+    Optional('rsync_workers'): And(Use(int), lambda n: n > 0),
+    Optional('single_rsync'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
+    Optional('rsync_flags'): [And(str, len)],
+    Optional('bwlimit'): Or(And(Use(int), lambda n: n > 0), And(str, len)),
+    Optional('incremental'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
     'groups': {
         str: [
-            {
+            And({
                 'name': And(str, len),
                 Optional('host'): And(str, len),
                 Optional('ssh_user'): And(str, len),
                 Optional('ssh_key'): And(str, len),
                 Optional('ssh_port'): And(Use(int), lambda n: 0 < n < 65536),
+                Optional('transport'): And(str, lambda s: s.lower() in ['ssh', 'daemon']),
+                Optional('rsync_module'): And(str, len),
+                Optional('rsync_port'): And(Use(int), lambda n: 0 < n < 65536),
                 Optional('appdata_path'): And(str, len),
                 Optional('restart'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
-                Optional('start_delay'): And(Use(int), lambda n: n >= 0)
-            }
+                Optional('start_delay'): And(Use(int), lambda n: n >= 0),
+                Optional('parallel'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
+                Optional('compress'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
+                Optional('skip_exists_check'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
+                Optional('sparse'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no'])),
+                Optional('fast_local_copy'): Or(bool, And(str, lambda s: s.lower() in ['yes', 'no']))
+            },
+            # Catch a missing module at validation time, not after the
+            # container has already been stopped for the backup.
+            lambda c: str(c.get('transport', 'ssh')).lower() != 'daemon' or bool(c.get('rsync_module')),
+            error="transport: daemon requires rsync_module")
         ]
     }
 })
 
-def get_docker_client(host='local'):
-    if host not in _docker_clients:
-        client = set_docker_client(host)
-        if client is None:
-            logger.critical(f"Could not create Docker client for host: {host}")
-            return None
-        _docker_clients[host] = client
-    return _docker_clients[host]
+def get_docker_client(host='local', ssh_user=None):
+    with _docker_clients_lock:
+        if host not in _docker_clients:
+            client = set_docker_client(host, ssh_user)
+            if client is None:
+                logger.critical(f"Could not create Docker client for host: {host}")
+                return None
+            _docker_clients[host] = client
+            _warm_container_cache(host, client)
+        return _docker_clients[host]
 
-def set_docker_client(host='local', timeout=30):
+def _warm_container_cache(host, docker_client):
+    """Pre-fill the container cache with one bulk list call instead of a GET per container."""
+    try:
+        containers = docker_client.containers.list(all=True, sparse=True)
+    except DockerException as e:
+        logger.debug("Could not pre-list containers on %s: %s", host, e)
+        return
+    with _container_cache_lock:
+        for container in containers:
+            _container_cache.setdefault((host, container.id), container)
+            for name in container.attrs.get('Names', []):
+                _container_cache.setdefault((host, name.lstrip('/')), container)
+    logger.debug("Pre-listed %d containers on %s", len(containers), host)
+
+def set_docker_client(host='local', ssh_user=None, timeout=30):
     try:
         if host == 'local':
             logger.debug("Connecting to local Docker engine...")
             return docker.from_env(timeout=timeout)
-        else:
-            remote_docker_url = f'tcp://{host}:2375'
-            logger.debug(f"Connecting to remote Docker at {remote_docker_url} with timeout={timeout}s...")
-            return docker.DockerClient(base_url=remote_docker_url, timeout=timeout)
+        if ssh_user:
+            # Talk to the remote daemon over SSH and its UNIX socket instead of plain TCP 2375.
+            remote_docker_url = f'ssh://{ssh_user}@{host}'
+            logger.debug("Connecting to remote Docker at %s with timeout=%ds...", remote_docker_url, timeout)
+            try:
+                return docker.DockerClient(base_url=remote_docker_url, timeout=timeout)
+            except DockerException as e:
+                logger.warning(f"SSH Docker connection to {host} failed ({e}), falling back to tcp://{host}:2375")
+        remote_docker_url = f'tcp://{host}:2375'
+        logger.debug("Connecting to remote Docker at %s with timeout=%ds...", remote_docker_url, timeout)
+        return docker.DockerClient(base_url=remote_docker_url, timeout=timeout)
     except DockerException as e:
         logger.error(f"Failed to connect to Docker on host '{host}': {e}")
         return None
 
+def ensure_ssh_master(host, ssh_user, ssh_key, ssh_port):
+    """Start a multiplexing SSH master for the host so later SSH/rsync calls reuse one channel."""
+    key = (host, ssh_user, ssh_port)
+    with _ssh_masters_lock:
+        if key in _ssh_masters:
+            return
+        master_cmd = [
+            "ssh", "-M", "-S", SSH_CONTROL_PATH,
+            "-o", "ControlPersist=600", "-o", "BatchMode=yes",
+            "-fN", "-p", str(ssh_port)
+        ]
+        if ssh_key:
+            master_cmd.extend(["-i", ssh_key])
+        master_cmd.append(f"{ssh_user}@{host}")
+        try:
+            subprocess.run(master_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            _ssh_masters[key] = master_cmd
+            logger.debug("Started SSH control master for %s@%s:%s", ssh_user, host, ssh_port)
+        except subprocess.CalledProcessError as e:
+            # Not fatal: without a control socket every SSH call just connects directly.
+            logger.debug("Could not start SSH control master for %s@%s:%s: %s", ssh_user, host, ssh_port, e)
+
+def _teardown_ssh_masters():
+    with _ssh_masters_lock:
+        for (host, ssh_user, ssh_port), _ in _ssh_masters.items():
+            exit_cmd = ["ssh", "-S", SSH_CONTROL_PATH, "-O", "exit", "-p", str(ssh_port), f"{ssh_user}@{host}"]
+            subprocess.run(exit_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _ssh_masters.clear()
+
+atexit.register(_teardown_ssh_masters)
+
+@lru_cache(maxsize=None)
 def remote_path_exists(host, ssh_user, ssh_key, ssh_port, remote_path):
-    check_cmd = ["ssh", "-o", "BatchMode=yes", "-p", str(ssh_port)]
+    check_cmd = ["ssh", "-o", "BatchMode=yes", "-o", f"ControlPath={SSH_CONTROL_PATH}", "-p", str(ssh_port)]
     if ssh_key:
         check_cmd.extend(["-i", ssh_key])
     check_cmd.append(f"{ssh_user}@{host}")
@@ -86,9 +218,17 @@ def remote_path_exists(host, ssh_user, ssh_key, ssh_port, remote_path):
     except subprocess.CalledProcessError:
         return False
 
+def get_container(container_id, docker_client, host):
+    """Fetch a container once per run and reuse the object for status, stop/start and attrs."""
+    key = (host, container_id)
+    with _container_cache_lock:
+        if key not in _container_cache:
+            _container_cache[key] = docker_client.containers.get(container_id)
+        return _container_cache[key]
+
 def is_container_running(container_id, host, docker_client):
     try:
-        container = docker_client.containers.get(container_id)
+        container = get_container(container_id, docker_client, host)
         return container.status == 'running'
     except docker.errors.NotFound:
         logger.warning(f"Container not found: {container_id}")
@@ -99,7 +239,7 @@ def stop_container(container_id, docker_client, host, dry_run=False):
     if dry_run:
         return
     try:
-        container = docker_client.containers.get(container_id)
+        container = get_container(container_id, docker_client, host)
         container.stop()
     except Exception as e:
         sub = f"Error stopping {container_id}"
@@ -112,7 +252,7 @@ def start_container(container_id, docker_client, host, dry_run=False):
     if dry_run:
         return
     try:
-        container = docker_client.containers.get(container_id)
+        container = get_container(container_id, docker_client, host)
         container.start()
     except Exception as e:
         sub = f"Error starting {container_id}"
@@ -120,9 +260,65 @@ def start_container(container_id, docker_client, host, dry_run=False):
         notify_host(sub, msg, icon="alert", dry_run=dry_run)
         logger.error(msg)
 
-def backup_container_appdata(source_path, dest_root, container_id, host, ssh_user, ssh_key=None, ssh_port=22, dry_run=False, debug=False):
-    source = Path(source_path)
+def _parse_rsync_stats(output):
+    """Pull the bytes/sec figure out of rsync --stats output, if present."""
+    if not output:
+        return None
+    match = re.search(r"([\d,\.]+) bytes/sec", output)
+    if not match:
+        return None
+    try:
+        return float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
+
+def _record_throughput(bytes_per_sec):
+    if bytes_per_sec is None:
+        return
+    with _run_throughputs_lock:
+        _run_throughputs.append(bytes_per_sec)
+
+def _load_tuning():
+    try:
+        with TUNING_FILE.open('r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_tuning(config):
+    """Persist this run's average throughput and nudge rsync_workers up while it keeps paying off."""
+    with _run_throughputs_lock:
+        if not _run_throughputs:
+            return
+        throughput = sum(_run_throughputs) / len(_run_throughputs)
+    tuning = _load_tuning()
+    workers = tuning.get("rsync_workers", config.get("rsync_workers", 4))
+    previous = tuning.get("throughput")
+    if previous and throughput >= previous * 1.1 and workers < MAX_RSYNC_WORKERS:
+        workers += 1
+        logger.debug("Throughput grew to %.0f bytes/sec, raising rsync_workers to %d", throughput, workers)
+    try:
+        TUNING_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with TUNING_FILE.open('w') as f:
+            json.dump({"rsync_workers": workers, "throughput": throughput}, f)
+    except OSError as e:
+        logger.debug("Could not persist tuning data: %s", e)
+
+def backup_container_appdata(source_path, dest_root, container_id, host, ssh_user, ssh_key=None, ssh_port=22, rsync_flags=None, compress=False, transport='ssh', rsync_module=None, rsync_port=873, bwlimit=None, skip_exists_check=False, sparse=False, incremental=False, dry_run=False, debug=False):
+    # source_path stays a plain string: it is only interpolated into the rsync
+    # command line, so a Path would be allocated just to be str()'d again.
+    source = source_path
     dest_path = Path(dest_root) / container_id
+    link_dest = None
+    if incremental:
+        # Snapshot mode: every run lands in its own timestamped directory and
+        # unchanged files are hardlinked from the previous snapshot, so they
+        # cost an inode instead of a rewrite. "latest" always points at the
+        # newest complete snapshot.
+        snapshot_root = dest_path
+        if (snapshot_root / "latest").is_dir():
+            link_dest = "../latest"
+        dest_path = snapshot_root / time.strftime("%Y-%m-%d_%H%M%S")
     logger.info(f"{'- DRY RUN -  ' if dry_run else ''}Backing up data from {host}:{source} to {dest_path}")
 
     if dry_run:
@@ -131,19 +327,45 @@ def backup_container_appdata(source_path, dest_root, container_id, host, ssh_use
         return
 
     if host == "local":
-        if not source.exists():
+        if not os.path.exists(source):
             raise FileNotFoundError(f"Source path does not exist: {source}")
-    else:
-        if not remote_path_exists(host, ssh_user, ssh_key, ssh_port, source):
+    elif transport != "daemon":
+        ensure_ssh_master(host, ssh_user, ssh_key, ssh_port)
+        # Cached per (host, user, port, path); "skip_exists_check: yes" drops the SSH
+        # round-trip entirely and lets rsync fail fast on a missing source instead.
+        if not skip_exists_check and not remote_path_exists(host, ssh_user, ssh_key, ssh_port, source):
             raise FileNotFoundError(f"Remote source path does not exist: {host}:{source}")
 
     try:
         dest_path.mkdir(parents=True, exist_ok=True)
 
-        rsync_command = ["rsync", "-a", "--info=progress2", "--delete"]
+        rsync_command = ["rsync"] + list(rsync_flags if rsync_flags else DEFAULT_RSYNC_FLAGS)
+        if sparse:
+            # --sparse doesn't combine with --inplace/-W: punch holes on the first pass,
+            # then switch to in-place delta updates once the destination is populated
+            # so already-dense files aren't rewritten from scratch.
+            rsync_command = [flag for flag in rsync_command if flag not in ("-W", "--whole-file", "--inplace", "--sparse")]
+            if any(dest_path.iterdir()):
+                rsync_command.extend(["--inplace", "--no-whole-file"])
+            else:
+                rsync_command.append("--sparse")
+        if incremental:
+            # A snapshot directory starts empty, so --delete is a no-op and
+            # --inplace (incompatible with --link-dest) must go.
+            rsync_command = [flag for flag in rsync_command if flag not in ("--inplace", "--delete")]
+            if link_dest:
+                rsync_command.append(f"--link-dest={link_dest}")
+        if compress and "-z" not in rsync_command:
+            rsync_command.append("-z")
+        rsync_command.append("--stats")
+        if bwlimit:
+            rsync_command.append(f"--bwlimit={bwlimit}")
 
-        if host != "local":
-            ssh_command = f"/usr/bin/ssh -o Compression=no -x -p {ssh_port}"
+        if host != "local" and transport == "daemon":
+            # rsyncd transport: no SSH channel, so no per-byte crypto cost.
+            rsync_command.append(f"rsync://{host}:{rsync_port}/{rsync_module}/")
+        elif host != "local":
+            ssh_command = f"/usr/bin/ssh -o Compression=no -o ControlPath={SSH_CONTROL_PATH} -x -p {ssh_port}"
             if ssh_key:
                 ssh_command += f" -i {ssh_key}"
             rsync_command.extend(["-e", ssh_command])
@@ -154,33 +376,203 @@ def backup_container_appdata(source_path, dest_root, container_id, host, ssh_use
         rsync_command.append(str(dest_path))
 
         if debug:
-            rsync_command.append("-v")
-            logger.debug(f"Running command: {' '.join(rsync_command)}")
+            rsync_command.extend(["--info=progress2", "-v"])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running command: %s", shlex.join(rsync_command))
 
-        result = subprocess.run(
-            rsync_command,
-            check=True,
-            text=True,
-            capture_output=debug
-        )
-        logger.info(f"Backup complete: {dest_path}")
         if debug:
-            if result.stdout:
-                logger.debug(f"rsync stdout:\n{result.stdout}")
-            if result.stderr:
-                logger.debug(f"rsync stderr:\n{result.stderr}")
+            # Stream rsync output line by line instead of buffering the whole -v
+            # transcript in memory; keep a short tail for the --stats summary.
+            process = subprocess.Popen(
+                rsync_command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            )
+            stats_tail = deque(maxlen=32)
+            for line in process.stdout:
+                line = line.rstrip()
+                if line:
+                    logger.debug(line)
+                stats_tail.append(line)
+            returncode = process.wait()
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, rsync_command)
+            output = "\n".join(stats_tail)
+        else:
+            result = subprocess.run(
+                rsync_command,
+                check=True,
+                text=True,
+                capture_output=True
+            )
+            output = result.stdout
+        if incremental:
+            # Flip "latest" atomically, and only after rsync succeeded, so a
+            # failed run never becomes the next snapshot's --link-dest basis.
+            tmp_link = snapshot_root / ".latest.tmp"
+            if tmp_link.is_symlink():
+                tmp_link.unlink()
+            os.symlink(dest_path.name, tmp_link)
+            os.replace(tmp_link, snapshot_root / "latest")
+        throughput = _parse_rsync_stats(output)
+        _record_throughput(throughput)
+        if throughput:
+            logger.info(f"Backup complete: {dest_path} ({throughput:.0f} bytes/sec)")
+        else:
+            logger.info(f"Backup complete: {dest_path}")
     except subprocess.CalledProcessError as e:
         sub = f"Backup error"
         msg = f"rsync failed for {container_id}: {e}"
         notify_host(sub, msg, icon="alert", dry_run=dry_run)
         logger.error(msg)
+        # stderr is captured for --stats parsing, so surface it on failure even
+        # in normal runs — an exit code alone is useless in cron mail.
+        if e.stderr:
+            logger.error("rsync stderr:\n%s", e.stderr.strip())
         if debug and e.stdout:
-            logger.debug(f"rsync stdout:\n{e.stdout}")
-        if debug and e.stderr:
-            logger.debug(f"rsync stderr:\n{e.stderr}")
+            logger.debug("rsync stdout:\n%s", e.stdout)
+
+def backup_container_appdata_parallel(source_path, dest_root, container_id, workers=4, dry_run=False, debug=False):
+    """Back up a large local appdata tree by sharding it across parallel rsync workers."""
+    source = Path(source_path)
+    dest_path = Path(dest_root) / container_id
+    logger.info(f"{'- DRY RUN -  ' if dry_run else ''}Backing up data from {source} to {dest_path} with {workers} rsync workers")
 
-def restore_container_appdata(backup_root, container_id, dest_path, host, ssh_user, ssh_key=None, ssh_port=22, dry_run=False, debug=False):
+    if dry_run:
+        logger.info(f"- DRY RUN - Would run {workers} parallel rsync workers from {source} to {dest_path}")
+        return
+
+    if not source.exists():
+        raise FileNotFoundError(f"Source path does not exist: {source}")
+
+    dest_path.mkdir(parents=True, exist_ok=True)
+
+    # Prefer fpsync when installed; it already does the sharding and scheduling.
+    fpsync = shutil.which("fpsync")
+    if fpsync:
+        fpsync_command = [fpsync, "-n", str(workers), f"{source}/", str(dest_path)]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running command: %s", shlex.join(fpsync_command))
+        try:
+            result = subprocess.run(fpsync_command, check=True, text=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            if e.stderr:
+                logger.error("fpsync stderr:\n%s", e.stderr.strip())
+            raise
+        if debug and result.stdout:
+            logger.debug("fpsync output:\n%s", result.stdout.strip())
+        logger.info(f"Backup complete: {dest_path}")
+        return
+
+    # Fallback: greedily pack top-level entries into N roughly-equal chunks by size
+    # and hand each chunk to its own rsync via --files-from.
+    entries = sorted(os.scandir(source), key=lambda e: e.stat(follow_symlinks=False).st_size, reverse=True)
+    chunks = [[] for _ in range(min(workers, max(len(entries), 1)))]
+    chunk_sizes = [0] * len(chunks)
+    for entry in entries:
+        smallest = chunk_sizes.index(min(chunk_sizes))
+        chunks[smallest].append(entry.name)
+        chunk_sizes[smallest] += entry.stat(follow_symlinks=False).st_size
+
+    procs = []
+    chunk_files = []
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            chunk_file = tempfile.NamedTemporaryFile(mode='w', prefix=f"abkp-{container_id}-", suffix=".list", delete=False)
+            chunk_file.write("\n".join(chunk) + "\n")
+            chunk_file.close()
+            chunk_files.append(chunk_file.name)
+            # -r is explicit: --files-from turns off the recursion implied by -a,
+            # and the chunk lists only name top-level entries.
+            rsync_command = [
+                "rsync", "-a", "-r", "--delete-missing-args",
+                f"--files-from={chunk_file.name}", f"{source}/", str(dest_path)
+            ]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Running command: %s", shlex.join(rsync_command))
+            procs.append(subprocess.Popen(rsync_command, text=True))
+
+        failed = [p.args for p in procs if p.wait() != 0]
+        if failed:
+            raise subprocess.CalledProcessError(1, failed[0])
+        logger.info(f"Backup complete: {dest_path}")
+    finally:
+        for chunk_file in chunk_files:
+            try:
+                os.unlink(chunk_file)
+            except OSError:
+                pass
+
+def _same_filesystem(source, dest):
+    try:
+        source_dev = os.stat(source).st_dev
+        probe = Path(dest)
+        while not probe.exists():
+            probe = probe.parent
+        return os.stat(probe).st_dev == source_dev
+    except OSError:
+        return False
+
+def _copy_file_range_loop(src_path, dst_path, size):
+    with open(src_path, 'rb') as fsrc, open(dst_path, 'wb') as fdst:
+        remaining = size
+        while remaining > 0:
+            copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    shutil.copystat(src_path, dst_path)
+
+def _copy_tree_fast(source, dest):
+    """Copy a tree with copy_file_range so btrfs/XFS can reflink instead of moving data."""
+    os.makedirs(dest, exist_ok=True)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            target = os.path.join(dest, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                _copy_tree_fast(entry.path, target)
+            elif entry.is_symlink():
+                if os.path.lexists(target):
+                    os.unlink(target)
+                os.symlink(os.readlink(entry.path), target)
+            elif entry.is_file(follow_symlinks=False):
+                try:
+                    _copy_file_range_loop(entry.path, target, entry.stat(follow_symlinks=False).st_size)
+                except OSError:
+                    # Filesystem without copy_file_range support; shutil picks
+                    # the next-best kernel fast path (sendfile) itself.
+                    shutil.copy2(entry.path, target)
+            else:
+                # FIFOs/sockets/devices: open() on a FIFO with no writer blocks
+                # forever, so never try to copy their contents.
+                logger.debug("Skipping special file %s", entry.path)
+    shutil.copystat(source, dest)
+
+def backup_container_appdata_fast(source_path, dest_root, container_id, dry_run=False):
+    """Same-filesystem backup via in-kernel copies; on reflink filesystems this is metadata-only."""
+    source = Path(source_path)
+    dest_path = Path(dest_root) / container_id
+    logger.info(f"{'- DRY RUN -  ' if dry_run else ''}Backing up data from {source} to {dest_path} with in-kernel copies")
+
+    if dry_run:
+        logger.info(f"- DRY RUN - Would copy tree {source} to {dest_path} via copy_file_range")
+        return
+
+    if not source.exists():
+        raise FileNotFoundError(f"Source path does not exist: {source}")
+
+    _copy_tree_fast(str(source), str(dest_path))
+    logger.info(f"Backup complete: {dest_path}")
+
+def restore_container_appdata(backup_root, container_id, dest_path, host, ssh_user, ssh_key=None, ssh_port=22, rsync_flags=None, compress=False, transport='ssh', rsync_module=None, rsync_port=873, incremental=False, dry_run=False, debug=False):
     src_path = Path(backup_root) / container_id
+    if incremental:
+        # Snapshot layout: restore from the newest complete snapshot.
+        src_path = src_path / "latest"
     logger.info(f"{'- DRY RUN -  ' if dry_run else ''}Restoring data to {host}:{dest_path} from {src_path}")
 
     if dry_run:
@@ -191,10 +583,16 @@ def restore_container_appdata(backup_root, container_id, dest_path, host, ssh_us
         raise FileNotFoundError(f"Backup path does not exist: {src_path}")
 
     try:
-        rsync_command = ["rsync", "-a", "--info=progress2", "--delete"]
+        rsync_command = ["rsync"] + list(rsync_flags if rsync_flags else DEFAULT_RSYNC_FLAGS)
+        if compress and "-z" not in rsync_command:
+            rsync_command.append("-z")
 
-        if host != "local":
-            ssh_command = f"/usr/bin/ssh -o Compression=no -x -p {ssh_port}"
+        if host != "local" and transport == "daemon":
+            rsync_command.append(f"{str(src_path)}/")
+            rsync_command.append(f"rsync://{host}:{rsync_port}/{rsync_module}/")
+        elif host != "local":
+            ensure_ssh_master(host, ssh_user, ssh_key, ssh_port)
+            ssh_command = f"/usr/bin/ssh -o Compression=no -o ControlPath={SSH_CONTROL_PATH} -x -p {ssh_port}"
             if ssh_key:
                 ssh_command += f" -i {ssh_key}"
             rsync_command.extend(["-e", ssh_command])
@@ -206,17 +604,32 @@ def restore_container_appdata(backup_root, container_id, dest_path, host, ssh_us
 
         if debug:
             rsync_command.append("-v")
-            logger.debug(f"Running restore command: {' '.join(rsync_command)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running restore command: %s", shlex.join(rsync_command))
 
-        result = subprocess.run(
-            rsync_command,
-            check=True,
-            text=True,
-            capture_output=debug
-        )
+        if debug:
+            # Stream restore output line by line, same as the backup path.
+            process = subprocess.Popen(
+                rsync_command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            )
+            for line in process.stdout:
+                line = line.rstrip()
+                if line:
+                    logger.debug(line)
+            returncode = process.wait()
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, rsync_command)
+        else:
+            subprocess.run(
+                rsync_command,
+                check=True,
+                text=True
+            )
         logger.info(f"Restore complete for appdata of {container_id}")
-        if debug and result.stdout:
-            logger.debug(result.stdout)
     except subprocess.CalledProcessError as e:
         logger.error(f"rsync failed during restore of {container_id}: {e}")
         if debug and e.stdout:
@@ -226,16 +639,45 @@ def restore_container_appdata(backup_root, container_id, dest_path, host, ssh_us
         notify_host("Restore error", str(e), icon="alert", dry_run=dry_run)
 
 def backup_container_json(container_id, backup_root, docker_client, host, dry_run=False):
-    json_path = Path(backup_root) / f"{container_id}.json"
+    # Plain strings: this runs once per container and only feeds open()/os.replace,
+    # so Path objects would be allocated just to be turned back into strings.
+    json_path = f"{backup_root}/{container_id}.json"
     logger.info(f"{'- DRY RUN -  ' if dry_run else ''}Saving container config to {json_path}")
     if dry_run:
         logger.info(f"- DRY RUN - Would write JSON config to {json_path}")
         return
     try:
-        container = docker_client.containers.get(container_id)
+        container = get_container(container_id, docker_client, host)
+        if 'Config' not in container.attrs:
+            # Cache entries from the bulk list are sparse; fetch the full inspect once.
+            container.reload()
         config_data = container.attrs
-        with json_path.open('w') as f:
-            json.dump(config_data, f, indent=2)
+        if orjson is not None:
+            serialized = orjson.dumps(config_data, option=orjson.OPT_INDENT_2)
+        else:
+            serialized = json.dumps(config_data, indent=2).encode()
+
+        # Container config rarely changes between runs; skipping the rewrite keeps the
+        # backup destination clean for snapshot/incremental tooling downstream.
+        digest = hashlib.sha256(serialized).hexdigest()
+        digest_path = f"{json_path}.sha256"
+        try:
+            if os.path.exists(json_path):
+                with open(digest_path) as f:
+                    if f.read().strip() == digest:
+                        logger.debug("Config for %s unchanged, skipping write", container_id)
+                        return
+        except OSError:
+            pass
+
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(serialized)
+        os.replace(tmp_path, json_path)
+        digest_tmp = f"{digest_path}.tmp"
+        with open(digest_tmp, 'w') as f:
+            f.write(digest + "\n")
+        os.replace(digest_tmp, digest_path)
         logger.info(f"Saved config for {container_id} to {json_path}")
     except docker.errors.NotFound:
         logger.warning(f"Container {container_id} not found.")
@@ -245,21 +687,466 @@ def backup_container_json(container_id, backup_root, docker_client, host, dry_ru
         notify_host(sub, msg, icon="alert", dry_run=dry_run)
         logger.error(msg)
 
-def notify_host(subject, message, icon, dry_run=False):
+def _as_bool(value):
+    return value.lower() == 'yes' if isinstance(value, str) else bool(value)
+
+def _normalize_container(container):
+    """Resolve defaults and yes/no strings once at config load instead of in every loop."""
+    return {
+        "name": container["name"],
+        "host": container.get("host", "local"),
+        "ssh_user": container.get("ssh_user"),
+        "ssh_key": container.get("ssh_key"),
+        "ssh_port": container.get("ssh_port", 22),
+        "transport": container.get("transport", "ssh"),
+        "rsync_module": container.get("rsync_module"),
+        "rsync_port": container.get("rsync_port", 873),
+        "appdata_path": container.get("appdata_path"),
+        "restart": _as_bool(container.get("restart", False)),
+        "start_delay": container.get("start_delay", 0),
+        "parallel": _as_bool(container.get("parallel", False)),
+        "compress": _as_bool(container.get("compress", False)),
+        "skip_exists_check": _as_bool(container.get("skip_exists_check", False)),
+        "sparse": _as_bool(container.get("sparse", False)),
+        "fast_local_copy": _as_bool(container.get("fast_local_copy", False)),
+    }
+
+def _prefetch_container_attrs(containers, host):
+    """Fetch full inspects for a bucket concurrently instead of one dockerd round-trip at a time."""
+    def _fetch(container):
+        client = get_docker_client(host, container.get("ssh_user"))
+        if client is None:
+            return
+        try:
+            cached = get_container(container["name"], client, host)
+            if 'Config' not in cached.attrs:
+                cached.reload()
+        except DockerException:
+            pass
+
+    with ThreadPoolExecutor(max_workers=min(16, len(containers))) as executor:
+        list(executor.map(_fetch, containers))
+
+def _estimate_container_size(container):
+    """Cheap size proxy for a container's appdata, used to schedule the largest backups first."""
+    source_path = container["appdata_path"]
+    if not source_path:
+        return 0
+    host = container["host"]
+    if host == "local":
+        try:
+            return sum(entry.stat(follow_symlinks=False).st_size for entry in os.scandir(source_path))
+        except OSError:
+            return 0
+    if container["transport"] == "daemon":
+        return 0
+    ssh_port = container["ssh_port"]
+    du_cmd = ["ssh", "-o", "BatchMode=yes", "-o", f"ControlPath={SSH_CONTROL_PATH}", "-p", str(ssh_port)]
+    if container["ssh_key"]:
+        du_cmd.extend(["-i", container["ssh_key"]])
+    du_cmd.append(f"{container['ssh_user']}@{host}")
+    du_cmd.append(f"du -sb '{source_path}'")
+    try:
+        result = subprocess.run(du_cmd, check=True, text=True, capture_output=True)
+        return int(result.stdout.split()[0])
+    except (subprocess.CalledProcessError, ValueError, IndexError):
+        return 0
+
+def _sort_largest_first(containers):
+    """LPT scheduling: dispatching the biggest appdata trees first minimizes total makespan."""
+    if len(containers) < 2:
+        return list(containers)
+    with ThreadPoolExecutor(max_workers=min(8, len(containers))) as executor:
+        sizes = list(executor.map(_estimate_container_size, containers))
+    return [container for _, container in sorted(
+        zip(sizes, containers), key=lambda pair: pair[0], reverse=True
+    )]
+
+def _pipeline_one(container, backup_root, config, args):
+    """Stop, back up and restart a single container independently of the rest of its group."""
+    container_id = container["name"]
+    host = container["host"]
+    client = get_docker_client(host, container["ssh_user"])
+    if client is None:
+        logger.error(f"Skipping container {container_id} due to Docker connection issue on {host}")
+        return
+    should_restart = container["restart"]
+
+    stopped = False
+    if should_restart and is_container_running(container_id, host, client):
+        stop_container(container_id, client, host, dry_run=args.dry_run)
+        stopped = True
+    elif should_restart:
+        logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}{container_id} was not running on {host}, skipping stop.")
+
+    try:
+        _backup_one(container, backup_root, config, args)
+    finally:
+        if stopped:
+            delay = container["start_delay"]
+            if delay > 0:
+                logger.info(f"Waiting {delay} seconds before starting {container_id} on {host}")
+                if not args.dry_run:
+                    time.sleep(delay)
+            start_container(container_id, client, host, dry_run=args.dry_run)
+
+def _partition_single_rsync(containers):
+    """Split a local bucket into groups syncable by one rsync (same appdata parent,
+    directory named after the container) and the containers that need their own run."""
+    batched = {}
+    leftovers = []
+    for container in containers:
+        source = container["appdata_path"]
+        if source and Path(source).name == container["name"]:
+            batched.setdefault(str(Path(source).parent), []).append(container)
+        else:
+            leftovers.append(container)
+    for parent, group in list(batched.items()):
+        if len(group) < 2:
+            leftovers.extend(group)
+            del batched[parent]
+    return batched, leftovers
+
+def _run_single_rsync(parent, group, backup_root, config, args):
+    """Sync several sibling appdata dirs with one rsync fed null-separated names on stdin."""
+    names = [container["name"] for container in group]
+    logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}Backing up {', '.join(names)} from {parent} with a single rsync")
+    if args.dry_run:
+        return
+    flags = list(config.get("rsync_flags") or DEFAULT_RSYNC_FLAGS)
+    # -a does not imply recursion under --files-from, so ask for it explicitly;
+    # with -r in place --delete prunes inside the listed dirs just like the
+    # per-container runs do.
+    rsync_command = ["rsync"] + flags + ["-r", "--from0", "--files-from=-", f"{parent}/", str(backup_root)]
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Running command: %s", shlex.join(rsync_command))
+    try:
+        subprocess.run(
+            rsync_command,
+            input="\0".join(names) + "\0",
+            check=True,
+            text=True,
+            capture_output=True
+        )
+    except subprocess.CalledProcessError as e:
+        # Same rationale as the per-container path: the bucket handler only
+        # logs str(e), so surface the captured stderr here.
+        if e.stderr:
+            logger.error("rsync stderr:\n%s", e.stderr.strip())
+        raise
+    logger.info(f"Batched backup complete for {len(names)} containers under {parent}")
+
+def _backup_json_only(container, backup_root, args):
+    container_id = container["name"]
+    host = container["host"]
+    client = get_docker_client(host, container["ssh_user"])
+    if client is None:
+        logger.error(f"Skipping container {container_id} due to Docker connection issue on {host}")
+        return
+    backup_container_json(container_id, backup_root, client, host, dry_run=args.dry_run)
+
+def _missing_sources(containers, host):
+    """Return (container_id, source) pairs whose appdata path does not exist.
+
+    Checked before any container is stopped, so a typo'd path can't cause
+    downtime for a backup that was never going to run. Remote checks go through
+    the memoized remote_path_exists and run in parallel to hide SSH latency.
+    """
+    to_check = [
+        c for c in containers
+        if c["appdata_path"] and not c["skip_exists_check"]
+    ]
+    if host == "local":
+        return [
+            (c["name"], c["appdata_path"])
+            for c in to_check if not Path(c["appdata_path"]).exists()
+        ]
+    # rsyncd containers have no SSH channel to probe; like the per-container
+    # path, let rsync fail fast on a missing module instead.
+    to_check = [c for c in to_check if c["transport"] != "daemon"]
+    if not to_check:
+        return []
+    missing = []
+    with ThreadPoolExecutor(max_workers=min(8, len(to_check))) as executor:
+        futures = {
+            executor.submit(
+                remote_path_exists, host, c["ssh_user"], c["ssh_key"],
+                c["ssh_port"], c["appdata_path"]
+            ): c
+            for c in to_check
+        }
+        for future in as_completed(futures):
+            if not future.result():
+                c = futures[future]
+                missing.append((c["name"], c["appdata_path"]))
+    return missing
+
+def _process_host_bucket(group_name, host, containers, backup_root, config, args):
+    # Buckets are submitted per (group, host); the per-host lock keeps two
+    # groups from hammering the same host's disks at once, so one host never
+    # sees more than max_parallel concurrent transfers.
+    with _host_bucket_lock(host):
+        _run_host_bucket(group_name, host, containers, backup_root, config, args)
+
+def _run_host_bucket(group_name, host, containers, backup_root, config, args):
+    max_parallel = config.get("max_parallel", 4)
+    _prefetch_container_attrs(containers, host)
+
+    missing = _missing_sources(containers, host)
+    if missing:
+        detail = ", ".join(f"{name}: {source}" for name, source in missing)
+        logger.error(f"Skipping {group_name} on {host}, missing source paths: {detail}")
+        notify_host(
+            f"Backup skipped for {group_name} on {host}",
+            f"Missing source paths: {detail}", icon="alert", dry_run=args.dry_run
+        )
+        return
+
+    # Pipelined mode: each container is stopped, backed up and restarted on its own,
+    # so its downtime is only as long as its own backup. Use only when containers in
+    # the group do not depend on each other's stop/start ordering.
+    if _as_bool(config.get("pipeline", False)):
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            futures = {
+                executor.submit(_pipeline_one, container, backup_root, config, args): container["name"]
+                for container in _sort_largest_first(containers)
+            }
+            for future in as_completed(futures):
+                container_id = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    notify_host(f"Backup error for {container_id}", str(e), icon="alert", dry_run=args.dry_run)
+                    logger.error(f"{container_id} backup failed: {e}")
+        return
+
+    containers_to_restart = []
+
+    # Step 1: Stop containers marked for restart. Each stop can block for the engine's
+    # full grace period, so the stops run concurrently; starts stay serial in Step 3
+    # because reverse order and start_delay encode dependencies.
+    for container in containers:
+        container_id = container["name"]
+        client = get_docker_client(host, container["ssh_user"])
+        if client is None:
+            logger.error(f"Skipping container {container_id} due to Docker connection issue on {host}")
+            continue
+        should_restart = container["restart"]
+
+        if should_restart and is_container_running(container_id, host, client):
+            containers_to_restart.append((container, client))
+        elif should_restart:
+            logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}{container_id} was not running on {host}, skipping stop.")
+        else:
+            logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}Skipping stop for {container_id} on {host} (restart=no).")
+
+    if containers_to_restart:
+        with ThreadPoolExecutor(max_workers=min(8, len(containers_to_restart))) as executor:
+            stop_futures = [
+                executor.submit(stop_container, container["name"], client, host, args.dry_run)
+                for container, client in containers_to_restart
+            ]
+            for future in as_completed(stop_futures):
+                future.result()
+
+    # Step 2: Perform backup (containers in a bucket run in parallel, bounded by max_parallel)
+    # single_rsync writes flat per-container directories, which doesn't mix
+    # with the timestamped snapshot layout.
+    if _as_bool(config.get("single_rsync", False)) and host == "local" and not _as_bool(config.get("incremental", False)):
+        batched, pool_containers = _partition_single_rsync(containers)
+    else:
+        batched, pool_containers = {}, containers
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        futures = {
+            executor.submit(_backup_one, container, backup_root, config, args): container["name"]
+            for container in _sort_largest_first(pool_containers)
+        }
+        for parent, group in batched.items():
+            futures[executor.submit(_run_single_rsync, parent, group, backup_root, config, args)] = parent
+            for container in group:
+                futures[executor.submit(_backup_json_only, container, backup_root, args)] = container["name"]
+        for future in as_completed(futures):
+            container_id = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                notify_host(f"Backup error for {container_id}", str(e), icon="alert", dry_run=args.dry_run)
+                logger.error(f"{container_id} backup failed: {e}")
+
+    # Step 3: Start previously stopped containers
+    for container_cfg, restart_client in reversed(containers_to_restart):
+        container_id = container_cfg["name"]
+        delay = container_cfg["start_delay"]
+        if delay > 0:
+            logger.info(f"Waiting {delay} seconds before starting {container_id} on {host}")
+            if not args.dry_run:
+                time.sleep(delay)
+        start_container(container_id, restart_client, host, dry_run=args.dry_run)
+
+def _backup_one(container, backup_root, config, args):
+    container_id = container["name"]
+    host = container["host"]
+    client = get_docker_client(host, container["ssh_user"])
+    if client is None:
+        logger.error(f"Skipping container {container_id} due to Docker connection issue on {host}")
+        return
+
+    # The JSON export (dockerd inspect + file write) runs alongside the rsync since
+    # they touch different subsystems; it is joined again at the end of this function.
+    with ThreadPoolExecutor(max_workers=1) as json_executor:
+        json_future = json_executor.submit(
+            backup_container_json, container_id, backup_root, client, host, dry_run=args.dry_run
+        )
+        try:
+            _backup_one_appdata(container, backup_root, config, args)
+        finally:
+            try:
+                json_future.result()
+            except Exception as e:
+                notify_host(f"Backup error for {container_id}", str(e), icon="alert", dry_run=args.dry_run)
+                logger.error(f"{container_id} config backup failed: {e}")
+
+def _backup_one_appdata(container, backup_root, config, args):
+    container_id = container["name"]
+    host = container["host"]
+    ssh_user = container["ssh_user"]
+    ssh_key = container["ssh_key"]
+    ssh_port = container["ssh_port"]
+    source_path = container["appdata_path"]
+
+    if not source_path:
+        logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}Skipping data backup for {container_id} (no path).")
+        return
+
+    skip_exists_check = container["skip_exists_check"]
+    sparse = container["sparse"]
+    use_parallel = container["parallel"]
+    incremental = _as_bool(config.get("incremental", False))
+
+    # Opt-in same-filesystem fast path: no data leaves the kernel, and reflink
+    # filesystems only touch metadata. Note it copies but never deletes stale
+    # destination files, unlike rsync --delete.
+    if container["fast_local_copy"] and host == "local" and not incremental:
+        if _same_filesystem(source_path, backup_root):
+            try:
+                backup_container_appdata_fast(source_path, backup_root, container_id, dry_run=args.dry_run)
+                return
+            except OSError as e:
+                logger.warning(f"Fast local copy failed for {container_id} ({e}), falling back to rsync.")
+        else:
+            logger.debug("%s: source and destination are on different filesystems, using rsync.", container_id)
+
+    if use_parallel and host != "local":
+        logger.debug("Parallel rsync is only supported for local sources, using a single rsync for %s.", container_id)
+        use_parallel = False
+    if use_parallel and incremental:
+        # The sharded workers don't share a --link-dest basis; snapshots need
+        # the single-rsync path.
+        logger.debug("Parallel rsync does not support incremental snapshots, using a single rsync for %s.", container_id)
+        use_parallel = False
+
+    try:
+        if use_parallel:
+            backup_container_appdata_parallel(
+                source_path, backup_root, container_id,
+                workers=config.get("rsync_workers", 4),
+                dry_run=args.dry_run, debug=args.debug
+            )
+        else:
+            backup_container_appdata(
+                source_path, backup_root, container_id, host,
+                ssh_user, ssh_key, ssh_port,
+                rsync_flags=config.get("rsync_flags"), compress=container["compress"],
+                transport=container["transport"],
+                rsync_module=container["rsync_module"],
+                rsync_port=container["rsync_port"],
+                bwlimit=config.get("bwlimit"),
+                skip_exists_check=skip_exists_check,
+                sparse=sparse,
+                incremental=incremental,
+                dry_run=args.dry_run, debug=args.debug
+            )
+    except Exception as e:
+        notify_host(f"Backup error for {container_id}", str(e), icon="alert", dry_run=args.dry_run)
+        logger.error(f"{container_id} backup failed: {e}")
+
+def notify_host(subject, message, icon, dry_run=False, immediate=False):
     if dry_run:
         logger.info(f"- DRY RUN - Would send notification: [{subject}] {message}")
         return
+    if immediate:
+        _send_notification(subject, message, icon)
+        return
+    with _notify_queue_lock:
+        _notify_queue.append((subject, message, icon))
+
+NOTIFY_SCRIPT = "/usr/local/emhttp/webGui/scripts/notify"
+
+def _send_notification(subject, message, icon):
+    argv = [
+        NOTIFY_SCRIPT,
+        "-e", "Unraid Appdata Backup Routine",
+        "-s", subject,
+        "-d", message,
+        "-i", icon
+    ]
     try:
-        subprocess.run([
-            "/usr/local/emhttp/webGui/scripts/notify",
-            "-e", "Unraid Appdata Backup Routine",
-            "-s", subject,
-            "-d", message,
-            "-i", icon
-        ], check=True)
-    except subprocess.CalledProcessError as e:
+        # posix_spawn: no fork of the interpreter and no subprocess pipe/thread
+        # setup — the script path is absolute so no PATH lookup either.
+        pid = os.posix_spawn(NOTIFY_SCRIPT, argv, os.environ)
+        _, status = os.waitpid(pid, 0)
+        if status != 0:
+            logger.error(f"Failed to send notification: notify exited with status {os.WEXITSTATUS(status)}")
+    except OSError as e:
         logger.error(f"Failed to send notification: {e}")
 
+def _flush_notifications():
+    """Send all queued notifications as one summary instead of forking notify per event."""
+    with _notify_queue_lock:
+        queued = list(_notify_queue)
+        _notify_queue.clear()
+    if not queued:
+        return
+    # A failure storm repeats the same event per container; collapse duplicates to a count.
+    counts = {}
+    for event in queued:
+        counts[event] = counts.get(event, 0) + 1
+    if len(counts) == 1 and len(queued) == 1:
+        subject, message, icon = queued[0]
+        _send_notification(subject, message, icon)
+        return
+    body = "\n".join(
+        f"{subject}: {message}" + (f" (x{count})" if count > 1 else "")
+        for (subject, message, _), count in counts.items()
+    )
+    icon = "alert" if any(icon == "alert" for _, _, icon in counts) else queued[0][2]
+    _send_notification(f"{len(queued)} events during backup run", body, icon)
+
+atexit.register(_flush_notifications)
+
+def _load_config():
+    """Load config.yaml, using an mtime/size-keyed JSON sidecar to skip YAML parsing on repeat runs."""
+    st = os.stat(CONFIG_FILE)
+    try:
+        with open(CONFIG_CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+        if cached.get("_mtime") == st.st_mtime_ns and cached.get("_size") == st.st_size:
+            logger.debug("Loaded config from cache sidecar %s", CONFIG_CACHE_FILE)
+            return cached["config"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    with open(CONFIG_FILE, 'r') as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+
+    try:
+        with open(CONFIG_CACHE_FILE, 'w') as f:
+            json.dump({"_mtime": st.st_mtime_ns, "_size": st.st_size, "config": config}, f)
+    except (OSError, TypeError) as e:
+        logger.debug("Could not write config cache sidecar: %s", e)
+    return config
+
 def main():
     parser = argparse.ArgumentParser(description="Unraid docker appdata backup tool")
     parser.add_argument("--group", type=str, help="Name of the group to back up (defaults to all groups)")
@@ -275,10 +1162,9 @@ def main():
         logger.debug("Debug logging enabled.")
 
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = yaml.safe_load(f)
+        config = _load_config()
     except FileNotFoundError:
-        notify_host("File not found Error", f"Config file '{CONFIG_FILE}' not found.", icon="alert", dry_run=args.dry_run)
+        notify_host("File not found Error", f"Config file '{CONFIG_FILE}' not found.", icon="alert", dry_run=args.dry_run, immediate=True)
         logger.critical(f"Config file '{CONFIG_FILE}' not found.")
         return
     except yaml.YAMLError as e:
@@ -289,10 +1175,17 @@ def main():
         config_schema.validate(config)
         logger.info("Config schema validation successful.")
     except SchemaError as e:
-        notify_host("Schema Error", f"Config validation error: {e}", icon="alert", dry_run=args.dry_run)
+        notify_host("Schema Error", f"Config validation error: {e}", icon="alert", dry_run=args.dry_run, immediate=True)
         logger.critical(f"Config schema validation failed: {e}")
         return
 
+    # One normalization pass: resolve defaults and yes/no strings up front so the
+    # stop/backup/start loops work with plain values.
+    config["groups"] = {
+        group_name: [_normalize_container(c) for c in containers]
+        for group_name, containers in config["groups"].items()
+    }
+
     if args.group and args.group not in config["groups"]:
         notify_host("Backup error", f"Group '{args.group}' not found in config.", icon="alert", dry_run=args.dry_run)
         logger.error(f"Group '{args.group}' not found in config.")
@@ -301,7 +1194,8 @@ def main():
     groups_to_process = (
         {args.group: config["groups"][args.group]} if args.group else config["groups"]
     )
-    store_by_group = config.get("store_by_group", False)
+    store_by_group = _as_bool(config.get("store_by_group", False))
+    base_dest = Path(config["backup_destination"])
 
     # --------------------------
     # RESTORE BACKUP TO GROUP / GROUP + CONTAINER
@@ -319,20 +1213,17 @@ def main():
         stopped_containers = set()
 
         for group_name, containers in restore_groups.items():
-            backup_root = (
-                Path(config["backup_destination"]) / group_name 
-                if store_by_group else Path(config["backup_destination"])
-            )
+            backup_root = base_dest / group_name if store_by_group else base_dest
             logger.info(f"Restoring group: {group_name}")
 
             for container in containers:
                 container_id = container["name"]
-                host = container.get("host", "local")
-                ssh_user = container.get("ssh_user")
-                ssh_key = container.get("ssh_key")
-                ssh_port = container.get("ssh_port", 22)
-                appdata_path = container.get("appdata_path")
-                client = get_docker_client(host)
+                host = container["host"]
+                ssh_user = container["ssh_user"]
+                ssh_key = container["ssh_key"]
+                ssh_port = container["ssh_port"]
+                appdata_path = container["appdata_path"]
+                client = get_docker_client(host, ssh_user)
                 if client is None:
                     logger.error(f"Skipping container {container_id} due to Docker connection issue on {host}")
                     continue
@@ -348,6 +1239,11 @@ def main():
                         restore_container_appdata(
                             backup_root, container_id, appdata_path, host,
                             ssh_user, ssh_key, ssh_port,
+                            rsync_flags=config.get("rsync_flags"), compress=container["compress"],
+                            transport=container["transport"],
+                            rsync_module=container["rsync_module"],
+                            rsync_port=container["rsync_port"],
+                            incremental=_as_bool(config.get("incremental", False)),
                             dry_run=args.dry_run, debug=args.debug
                         )
                     except Exception as e:
@@ -357,84 +1253,56 @@ def main():
                 if (container_id, host) in stopped_containers:
                     start_container(container_id, client, host, dry_run=args.dry_run)
 
+        _flush_notifications()
         return  # Done with restore, skip backup
 
     # --------------------------
     # PERFORM A BACKUP IF --restore IS NOT PASSED
     # --------------------------
-    for group_name, containers in groups_to_process.items():
-        backup_root = Path(config["backup_destination"]) / group_name if store_by_group else Path(config["backup_destination"])
-        if args.dry_run:
-            logger.info(f"- DRY RUN - Would create directory {backup_root} if it doesn't exist")
-        else:
-            backup_root.mkdir(parents=True, exist_ok=True)
-
-        logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}Processing group: {group_name}")
-        containers_to_restart = []
+    # Apply the auto-tuned worker count from earlier runs, but never below the configured value.
+    tuned_workers = _load_tuning().get("rsync_workers")
+    if tuned_workers and tuned_workers > config.get("rsync_workers", 4):
+        logger.debug("Using auto-tuned rsync_workers=%d", tuned_workers)
+        config["rsync_workers"] = tuned_workers
 
-        # Step 1: Stop containers marked for restart
-        for container in containers:
-            container_id = container["name"]
-            host = container.get("host", "local")
-            client = get_docker_client(host)
-            if client is None:
-                logger.error(f"Skipping container {container_id} due to Docker connection issue on {host}")
-                continue
-            restart_value = container.get("restart", False)
-            should_restart = str(restart_value).lower() == "yes" if isinstance(restart_value, str) else bool(restart_value)
-
-            if should_restart and is_container_running(container_id, host, client):
-                containers_to_restart.append(container_id)
-                stop_container(container_id, client, host, dry_run=args.dry_run)
-            elif should_restart:
-                logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}{container_id} was not running on {host}, skipping stop.")
-            else:
-                logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}Skipping stop for {container_id} on {host} (restart=no).")
-
-        # Step 2: Perform backup
-        for container in containers:
-            container_id = container["name"]
-            host = container.get("host", "local")
-            ssh_user = container.get("ssh_user")
-            ssh_key = container.get("ssh_key")
-            ssh_port = container.get("ssh_port", 22)
-            client = get_docker_client(host)
-            if client is None:
-                logger.error(f"Skipping container {container_id} due to Docker connection issue on {host}")
-                continue
-            source_path = container.get("appdata_path")
+    # Containers are bucketed per (group, host) so transfers to different hosts
+    # run concurrently; buckets that share a host serialize on a per-host lock
+    # inside _process_host_bucket, keeping stop -> backup -> start order and
+    # bounding each host to max_parallel transfers.
+    with ThreadPoolExecutor() as bucket_executor:
+        bucket_futures = {}
+        created_roots = set()
+        for group_name, containers in groups_to_process.items():
+            backup_root = base_dest / group_name if store_by_group else base_dest
+            if args.dry_run:
+                logger.info(f"- DRY RUN - Would create directory {backup_root} if it doesn't exist")
+            elif backup_root not in created_roots:
+                # Without store_by_group every group shares one root; only stat/mkdir it once.
+                backup_root.mkdir(parents=True, exist_ok=True)
+                created_roots.add(backup_root)
 
-            backup_container_json(container_id, backup_root, client, host, dry_run=args.dry_run)
+            logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}Processing group: {group_name}")
 
-            if not source_path:
-                logger.info(f"{'- DRY RUN -  ' if args.dry_run else ''}Skipping data backup for {container_id} (no path).")
-                continue
+            buckets = {}
+            for container in containers:
+                buckets.setdefault(container["host"], []).append(container)
+            for host, bucket in buckets.items():
+                future = bucket_executor.submit(
+                    _process_host_bucket, group_name, host, bucket, backup_root, config, args
+                )
+                bucket_futures[future] = (group_name, host)
 
+        for future in as_completed(bucket_futures):
+            group_name, host = bucket_futures[future]
             try:
-                backup_container_appdata(
-                    source_path, backup_root, container_id, host,
-                    ssh_user, ssh_key, ssh_port,
-                    dry_run=args.dry_run, debug=args.debug
-                )
+                future.result()
             except Exception as e:
-                notify_host(f"Backup error for {container_id}", str(e), icon="alert", dry_run=args.dry_run)
-                logger.error(f"{container_id} backup failed: {e}")
+                notify_host(f"Backup error for group {group_name}", str(e), icon="alert", dry_run=args.dry_run)
+                logger.error(f"Backup of group {group_name} on {host} failed: {e}")
 
-        # Step 3: Start previously stopped containers
-        for container_id in reversed(containers_to_restart):
-            container_cfg = next((c for c in containers if c["name"] == container_id), {})
-            host = container_cfg.get("host", "local")
-            restart_client = get_docker_client(host)
-            if restart_client is None:
-                logger.error(f"Skipping restart of container {container_id} due to Docker connection issue on {host}")
-                continue
-            delay = container_cfg.get("start_delay", 0)
-            if delay > 0:
-                logger.info(f"Waiting {delay} seconds before starting {container_id} on {host}")
-                if not args.dry_run:
-                    import time
-                    time.sleep(delay)
-            start_container(container_id, restart_client, host, dry_run=args.dry_run)
+    if not args.dry_run:
+        _save_tuning(config)
+    _flush_notifications()
 
 if __name__ == '__main__':
     main()